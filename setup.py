@@ -8,5 +8,14 @@ here = pathlib.Path(__file__).parent.resolve()
 setup(
 	name="spacebar",
 	version="0.1.0",
-	packages=find_packages()
+	packages=find_packages(),
+	extras_require={
+		"numpy": ["numpy"],
+		"numba": ["numpy", "numba"]
+	},
+	entry_points={
+		"console_scripts": [
+			"spacebar-propagate=spacebar.cli:main"
+		]
+	}
 )
@@ -0,0 +1,135 @@
+import importlib
+import os
+import typing
+import warnings
+
+from types import ModuleType
+
+#Each backend module implements eccentric_anomaly, elements_from_state,
+#pq_vectors, and two_body_states with the same signatures
+BACKENDS = {
+    "python": "spacebar.astro.kernels.python_kernels",
+    "numpy": "spacebar.astro.kernels.numpy_kernels",
+    "numba": "spacebar.astro.kernels.numba_kernels",
+}
+
+#Backend tried next when the dependencies of a backend are not installed
+FALLBACKS = {"numba": "numpy", "numpy": "python"}
+
+#Environment variable used to choose the backend before first use
+ENVIRONMENT_VARIABLE = "SPACEBAR_BACKEND"
+
+_active_name = None
+_active_module = None
+
+def load_backend(name:str) -> ModuleType:
+    """import the kernel module of a backend
+
+    Args:
+        name:   one of the keys of BACKENDS
+
+    Returns:
+        module implementing the kernels
+
+    Raises:
+        ValueError:     name is not a known backend
+        ImportError:    dependencies of the backend are not installed
+
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            "unknown backend %s, expected one of %s or auto" % (
+                name, ", ".join(BACKENDS)
+            )
+        )
+    return importlib.import_module(BACKENDS[name])
+
+def available_backends() -> typing.List[str]:
+    """get the backends whose dependencies are installed
+
+    Args:
+        None
+
+    Returns:
+        names of backends that can be selected without falling back
+
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def set_backend(name:str) -> str:
+    """select the backend used by the propagators
+
+    If the dependencies of the requested backend are not installed, the
+    next backend in FALLBACKS is tried and a RuntimeWarning is issued.  The
+    name auto selects the fastest available backend without warning.
+
+    Args:
+        name:   one of the keys of BACKENDS or auto
+
+    Returns:
+        name of the backend that was selected
+
+    """
+    global _active_name, _active_module
+
+    warn = name != "auto"
+    if not warn:
+        name = "numba"
+
+    while True:
+        try:
+            module = load_backend(name)
+            break
+        except ImportError as err:
+            fallback = FALLBACKS.get(name)
+            if fallback is None:
+                raise
+            if warn:
+                warnings.warn(
+                    "%s backend unavailable (%s), falling back to %s" % (
+                        name, err, fallback
+                    ),
+                    RuntimeWarning
+                )
+            name = fallback
+
+    _active_name = name
+    _active_module = module
+    return name
+
+def get_backend() -> ModuleType:
+    """get the kernel module of the selected backend
+
+    The backend named by the SPACEBAR_BACKEND environment variable, or the
+    python backend if it is not set, is selected on first use
+
+    Args:
+        None
+
+    Returns:
+        module implementing the kernels
+
+    """
+    if _active_module is None:
+        set_backend(os.environ.get(ENVIRONMENT_VARIABLE, "python"))
+    return _active_module
+
+def get_backend_name() -> str:
+    """get the name of the selected backend
+
+    Args:
+        None
+
+    Returns:
+        one of the keys of BACKENDS
+
+    """
+    get_backend()
+    return _active_name
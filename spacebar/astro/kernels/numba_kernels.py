@@ -0,0 +1,229 @@
+import typing
+
+from math import atan2, cos, isnan, pi, sin, sqrt
+
+import numpy as np
+from numba import njit
+
+from spacebar.astro.bodies import Earth
+
+#Compiled backend.  The scalar kernels below are fused into explicit loops
+#that write into preallocated arrays, so no temporaries are created per
+#element.  Compiled code is cached on disk after the first call.
+
+MU = Earth.mu
+
+@njit(cache=True)
+def _kepler(mean_anom, ecc):
+    ea_0 = mean_anom
+    if ecc > .8:
+        ea_0 = pi
+    while True:
+        num = mean_anom - ea_0 + ecc*sin(ea_0)
+        den = 1 - ecc*cos(ea_0)
+        ea_n = ea_0 + num/den
+        if abs(ea_n - ea_0) < 1e-12 or isnan(ea_n):
+            break
+        ea_0 = ea_n
+    if ea_n < 0:
+        ea_n += pi*2.0
+    return ea_n
+
+@njit(cache=True)
+def _elements(rx, ry, rz, vx, vy, vz):
+    hx = ry*vz - rz*vy
+    hy = rz*vx - rx*vz
+    hz = rx*vy - ry*vx
+    h = sqrt(hx**2 + hy**2 + hz**2)
+    wx = hx/h
+    wy = hy/h
+    wz = hz/h
+
+    inc = atan2(sqrt(wx**2 + wy**2), wz)
+    if inc == 0:
+        raan = 0.0
+    else:
+        raan = atan2(wx, -wy)
+    if raan < 0:
+        raan += 2*pi
+
+    r = sqrt(rx**2 + ry**2 + rz**2)
+    v = sqrt(vx**2 + vy**2 + vz**2)
+    p = h**2/MU
+    a = 1/(2/r - v**2/MU)
+    n = sqrt(MU/a**3)
+    e_squared = 1 - p/a
+    e = 0.0 if e_squared < 0 else sqrt(e_squared)
+
+    ea = atan2((rx*vx + ry*vy + rz*vz)/(a**2*n), 1 - r/a)
+    ma = ea - e*sin(ea)
+    if ma < 0:
+        ma += pi*2
+
+    u = atan2(rz, -rx*wy + ry*wx)
+    ta = atan2(sqrt(1 - e**2)*sin(ea), cos(ea) - e)
+    if ta < 0:
+        ta += pi*2
+
+    aop = u - ta
+    if aop < 0:
+        aop += pi*2
+
+    return a, inc, e, raan, aop, ma
+
+@njit(cache=True)
+def _pq(inc, raan, aop):
+    cw = cos(aop)
+    cO = cos(raan)
+    sw = sin(aop)
+    sO = sin(raan)
+    ci = cos(inc)
+    si = sin(inc)
+
+    px = cw*cO - sw*ci*sO
+    py = cw*sO + sw*ci*cO
+    pz = sw*si
+    p = sqrt(px**2 + py**2 + pz**2)
+
+    qx = -sw*cO - cw*ci*sO
+    qy = -sw*sO + cw*ci*cO
+    qz = cw*si
+    q = sqrt(qx**2 + qy**2 + qz**2)
+
+    return px/p, py/p, pz/p, qx/q, qy/q, qz/q
+
+@njit(cache=True)
+def _eccentric_anomaly_loop(mean_anom, ecc, out):
+    for i in range(out.shape[0]):
+        out[i] = _kepler(mean_anom[i], ecc[i])
+
+@njit(cache=True)
+def _elements_loop(rx, ry, rz, vx, vy, vz, out):
+    for i in range(out.shape[1]):
+        state = _elements(rx[i], ry[i], rz[i], vx[i], vy[i], vz[i])
+        for j in range(6):
+            out[j, i] = state[j]
+
+@njit(cache=True)
+def _pq_loop(inc, raan, aop, out):
+    for i in range(out.shape[1]):
+        pq = _pq(inc[i], raan[i], aop[i])
+        for j in range(6):
+            out[j, i] = pq[j]
+
+@njit(cache=True)
+def _two_body_loop(rx, ry, rz, vx, vy, vz, dt, out):
+    a, inc, e, raan, aop, ma0 = _elements(rx, ry, rz, vx, vy, vz)
+    px, py, pz, qx, qy, qz = _pq(inc, raan, aop)
+    n = sqrt(MU/a**3)
+    root_one_minus_e2 = sqrt(1 - e*e)
+
+    for i in range(dt.shape[0]):
+        en = _kepler(ma0 + n*dt[i], e)
+        cos_en = cos(en)
+        sin_en = sin(en)
+
+        p_scale = a*(cos_en - e)
+        q_scale = a*root_one_minus_e2*sin_en
+        out[0, i] = px*p_scale + qx*q_scale
+        out[1, i] = py*p_scale + qy*q_scale
+        out[2, i] = pz*p_scale + qz*q_scale
+
+        multiple = sqrt(MU*a)/(a*(1 - e*cos_en))
+        p_scale = -sin_en*multiple
+        q_scale = root_one_minus_e2*cos_en*multiple
+        out[3, i] = px*p_scale + qx*q_scale
+        out[4, i] = py*p_scale + qy*q_scale
+        out[5, i] = pz*p_scale + qz*q_scale
+
+def _as_arrays(*columns) -> typing.List[np.ndarray]:
+    """convert columns to contiguous float64 arrays of a common length"""
+    return [
+        np.ascontiguousarray(c, dtype=np.float64)
+        for c in np.broadcast_arrays(*[np.atleast_1d(c) for c in columns])
+    ]
+
+def eccentric_anomaly(
+    mean_anom:typing.Sequence[float], ecc:typing.Sequence[float]
+) -> np.ndarray:
+    """Solve eccentric anomaly for each mean anomaly and eccentricity pair
+
+    Args:
+        mean_anom:      mean anomalies of the orbits in radians
+        ecc:            eccentricities of the orbits
+
+    Returns:
+        eccentric anomalies in radians
+
+    """
+    m, e = _as_arrays(mean_anom, ecc)
+    out = np.empty(m.shape[0])
+    _eccentric_anomaly_loop(m, e, out)
+    return out
+
+def elements_from_state(
+    rx:typing.Sequence[float], ry:typing.Sequence[float],
+    rz:typing.Sequence[float], vx:typing.Sequence[float],
+    vy:typing.Sequence[float], vz:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Solve classical elements for each ECI position and velocity
+
+    Args:
+        rx, ry, rz:     components of the positions in kilometers
+        vx, vy, vz:     components of the velocities in kilometers per second
+
+    Returns:
+        semi-major axis, inclination, eccentricity, raan, argument of perigee,
+        and mean anomaly of each state
+
+    """
+    columns = _as_arrays(rx, ry, rz, vx, vy, vz)
+    out = np.empty((6, columns[0].shape[0]))
+    _elements_loop(*columns, out)
+    return tuple(out)
+
+def pq_vectors(
+    inc:typing.Sequence[float], raan:typing.Sequence[float],
+    aop:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Solve perigee (P) and semi-latus rectum (Q) unit vectors
+
+    Args:
+        inc:    inclinations in radians
+        raan:   right ascensions of ascending node in radians
+        aop:    arguments of perigee in radians
+
+    Returns:
+        x, y, and z components of P followed by those of Q
+
+    """
+    columns = _as_arrays(inc, raan, aop)
+    out = np.empty((6, columns[0].shape[0]))
+    _pq_loop(*columns, out)
+    return tuple(out)
+
+def two_body_states(
+    rx:float, ry:float, rz:float, vx:float, vy:float, vz:float,
+    dt:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Propagate a single state to each time offset with two-body motion
+
+    Note:
+        The state must describe an elliptical orbit
+
+    Args:
+        rx, ry, rz:     components of the initial position in kilometers
+        vx, vy, vz:     components of the initial velocity in km/s
+        dt:             seconds elapsed since the initial state
+
+    Returns:
+        x, y, and z components of position followed by those of velocity
+
+    """
+    dt = np.ascontiguousarray(dt, dtype=np.float64)
+    out = np.empty((6, dt.shape[0]))
+    _two_body_loop(
+        float(rx), float(ry), float(rz), float(vx), float(vy), float(vz),
+        dt, out
+    )
+    return tuple(out)
@@ -0,0 +1,206 @@
+import typing
+
+import numpy as np
+
+from spacebar.astro.bodies import Earth
+
+#Vectorized backend.  Each kernel mirrors the operations of the reference
+#backend in python_kernels.py over whole arrays at once.
+
+def eccentric_anomaly(
+    mean_anom:typing.Sequence[float], ecc:typing.Sequence[float]
+) -> np.ndarray:
+    """Solve eccentric anomaly for each mean anomaly and eccentricity pair
+
+    Only elements that have not met tolerance are updated on each iteration.
+    NaN never meets tolerance, so it also stops the iteration
+
+    Args:
+        mean_anom:      mean anomalies of the orbits in radians
+        ecc:            eccentricities of the orbits
+
+    Returns:
+        eccentric anomalies in radians
+
+    """
+    m, e = np.broadcast_arrays(
+        np.asarray(mean_anom, dtype=np.float64),
+        np.asarray(ecc, dtype=np.float64)
+    )
+
+    #Seed E sub i with mean anomaly, or pi for high eccentricities
+    ea_0 = np.where(e > .8, np.pi, m)
+    ea_n = ea_0.copy()
+    active = np.flatnonzero(np.ones(m.shape, dtype=bool))
+
+    #Iterate until every element meets tolerance
+    while active.size:
+        m_a = m.flat[active]
+        e_a = e.flat[active]
+        ea_a = ea_0.flat[active]
+        num = m_a - ea_a + e_a*np.sin(ea_a)
+        den = 1 - e_a*np.cos(ea_a)
+        new = ea_a + num/den
+        ea_n.flat[active] = new
+        ea_0.flat[active] = new
+        active = active[(np.abs(new - ea_a) >= 1e-12) & ~np.isnan(new)]
+
+    #Correct for negative values
+    ea_n[ea_n < 0] += np.pi*2.0
+
+    return ea_n
+
+def elements_from_state(
+    rx:typing.Sequence[float], ry:typing.Sequence[float],
+    rz:typing.Sequence[float], vx:typing.Sequence[float],
+    vy:typing.Sequence[float], vz:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Solve classical elements for each ECI position and velocity
+
+    Follows the procedures on pages 28-29 of Satellite Orbits
+
+    Args:
+        rx, ry, rz:     components of the positions in kilometers
+        vx, vy, vz:     components of the velocities in kilometers per second
+
+    Returns:
+        semi-major axis, inclination, eccentricity, raan, argument of perigee,
+        and mean anomaly of each state
+
+    """
+    rx, ry, rz, vx, vy, vz = [
+        np.asarray(c, dtype=np.float64) for c in (rx, ry, rz, vx, vy, vz)
+    ]
+
+    #Get the unit momentum vector (Eq. 2.56 and 2.57)
+    hx = ry*vz - rz*vy
+    hy = rz*vx - rx*vz
+    hz = rx*vy - ry*vx
+    h = np.sqrt(hx**2 + hy**2 + hz**2)
+    wx = hx/h
+    wy = hy/h
+    wz = hz/h
+
+    #Get inc and raan (Eq. 2.58)
+    inc = np.arctan2(np.sqrt(wx**2 + wy**2), wz)
+    raan = np.where(inc == 0, 0.0, np.arctan2(wx, -wy))
+    raan = np.where(raan < 0, raan + 2*np.pi, raan)
+
+    #Solve semi-latus rectum, semi-major axis, and mean motion (Eq. 2.59-61)
+    r = np.sqrt(rx**2 + ry**2 + rz**2)
+    v = np.sqrt(vx**2 + vy**2 + vz**2)
+    p = h**2/Earth.mu
+    a = 1/(2/r - v**2/Earth.mu)
+    n = np.sqrt(Earth.mu/a**3)
+
+    #Solve eccentricity (Eq. 2.62), clamping rounding below zero to circular
+    e_squared = 1 - p/a
+    e = np.sqrt(np.where(e_squared < 0, 0.0, e_squared))
+
+    #Solve eccentric and mean anomaly (Eq. 2.64 and 2.65)
+    ea = np.arctan2((rx*vx + ry*vy + rz*vz)/(a**2*n), 1 - r/a)
+    ma = ea - e*np.sin(ea)
+    ma = np.where(ma < 0, ma + np.pi*2, ma)
+
+    #Solve argument of latitude and true anomaly (Eq. 2.66 and 2.67)
+    u = np.arctan2(rz, -rx*wy + ry*wx)
+    ta = np.arctan2(np.sqrt(1 - e**2)*np.sin(ea), np.cos(ea) - e)
+    ta = np.where(ta < 0, ta + np.pi*2, ta)
+
+    #Solve argument of perigee (Eq. 2.68)
+    aop = u - ta
+    aop = np.where(aop < 0, aop + np.pi*2, aop)
+
+    return a, inc, e, raan, aop, ma
+
+def pq_vectors(
+    inc:typing.Sequence[float], raan:typing.Sequence[float],
+    aop:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Solve perigee (P) and semi-latus rectum (Q) unit vectors
+
+    Follows equations 2.52 and 2.53 from Satellite Orbits
+
+    Args:
+        inc:    inclinations in radians
+        raan:   right ascensions of ascending node in radians
+        aop:    arguments of perigee in radians
+
+    Returns:
+        x, y, and z components of P followed by those of Q
+
+    """
+    inc, raan, aop = [
+        np.asarray(c, dtype=np.float64) for c in (inc, raan, aop)
+    ]
+    cw = np.cos(aop)
+    cO = np.cos(raan)
+    sw = np.sin(aop)
+    sO = np.sin(raan)
+    ci = np.cos(inc)
+    si = np.sin(inc)
+
+    px = cw*cO - sw*ci*sO
+    py = cw*sO + sw*ci*cO
+    pz = sw*si
+    p = np.sqrt(px**2 + py**2 + pz**2)
+
+    qx = -sw*cO - cw*ci*sO
+    qy = -sw*sO + cw*ci*cO
+    qz = cw*si
+    q = np.sqrt(qx**2 + qy**2 + qz**2)
+
+    return px/p, py/p, pz/p, qx/q, qy/q, qz/q
+
+def two_body_states(
+    rx:float, ry:float, rz:float, vx:float, vy:float, vz:float,
+    dt:typing.Sequence[float]
+) -> typing.Tuple[np.ndarray, ...]:
+    """Propagate a single state to each time offset with two-body motion
+
+    Follows equations 2.37, 2.43, and 2.44 from Satellite Orbits
+
+    Note:
+        The state must describe an elliptical orbit
+
+    Args:
+        rx, ry, rz:     components of the initial position in kilometers
+        vx, vy, vz:     components of the initial velocity in km/s
+        dt:             seconds elapsed since the initial state
+
+    Returns:
+        x, y, and z components of position followed by those of velocity
+
+    """
+    dt = np.asarray(dt, dtype=np.float64)
+    a, inc, e, raan, aop, ma0 = [
+        c[0] for c in elements_from_state(
+            [rx], [ry], [rz], [vx], [vy], [vz]
+        )
+    ]
+    px, py, pz, qx, qy, qz = [c[0] for c in pq_vectors([inc], [raan], [aop])]
+
+    #Get mean anomaly after delta t (Equation 2.37) and solve Kepler
+    ma = ma0 + np.sqrt(Earth.mu/a**3)*dt
+    en = eccentric_anomaly(ma, e)
+    cos_en = np.cos(en)
+    sin_en = np.sin(en)
+    root_one_minus_e2 = np.sqrt(1 - e*e)
+
+    #Solve position using equation 2.43
+    p_scale = a*(cos_en - e)
+    q_scale = a*root_one_minus_e2*sin_en
+
+    #Solve velocity using equation 2.44
+    multiple = np.sqrt(Earth.mu*a)/(a*(1 - e*cos_en))
+    vp_scale = -sin_en*multiple
+    vq_scale = root_one_minus_e2*cos_en*multiple
+
+    return (
+        px*p_scale + qx*q_scale,
+        py*p_scale + qy*q_scale,
+        pz*p_scale + qz*q_scale,
+        px*vp_scale + qx*vq_scale,
+        py*vp_scale + qy*vq_scale,
+        pz*vp_scale + qz*vq_scale
+    )
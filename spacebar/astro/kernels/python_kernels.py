@@ -0,0 +1,141 @@
+import typing
+
+from math import cos, sin, sqrt
+
+from spacebar.astro.bodies import Earth
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.orbit.elements import ClassicalElements
+
+#Reference backend.  Each kernel loops over its inputs with the scalar
+#methods of ClassicalElements so the other backends have a ground truth.
+
+def eccentric_anomaly(
+    mean_anom:typing.Sequence[float], ecc:typing.Sequence[float]
+) -> typing.List[float]:
+    """Solve eccentric anomaly for each mean anomaly and eccentricity pair
+
+    Args:
+        mean_anom:      mean anomalies of the orbits in radians
+        ecc:            eccentricities of the orbits
+
+    Returns:
+        eccentric anomalies in radians
+
+    """
+    return [
+        ClassicalElements.equation_to_eccentric_anomaly(m, e)
+        for m, e in zip(mean_anom, ecc)
+    ]
+
+def elements_from_state(
+    rx:typing.Sequence[float], ry:typing.Sequence[float],
+    rz:typing.Sequence[float], vx:typing.Sequence[float],
+    vy:typing.Sequence[float], vz:typing.Sequence[float]
+) -> typing.Tuple[typing.List[float], ...]:
+    """Solve classical elements for each ECI position and velocity
+
+    Args:
+        rx, ry, rz:     components of the positions in kilometers
+        vx, vy, vz:     components of the velocities in kilometers per second
+
+    Returns:
+        semi-major axis, inclination, eccentricity, raan, argument of perigee,
+        and mean anomaly of each state
+
+    """
+    columns = ([], [], [], [], [], [])
+    for state in zip(rx, ry, rz, vx, vy, vz):
+        coes = ClassicalElements.from_position_and_velocity(
+            Vector3D(*state[:3]),
+            Vector3D(*state[3:])
+        )
+        for column, value in zip(columns, (
+            coes.semi_major_axis, coes.inclination, coes.eccentricity,
+            coes.raan, coes.arg_of_perigee, coes.mean_anomaly
+        )):
+            column.append(value)
+    return columns
+
+def pq_vectors(
+    inc:typing.Sequence[float], raan:typing.Sequence[float],
+    aop:typing.Sequence[float]
+) -> typing.Tuple[typing.List[float], ...]:
+    """Solve perigee (P) and semi-latus rectum (Q) unit vectors
+
+    Args:
+        inc:    inclinations in radians
+        raan:   right ascensions of ascending node in radians
+        aop:    arguments of perigee in radians
+
+    Returns:
+        x, y, and z components of P followed by those of Q
+
+    """
+    columns = ([], [], [], [], [], [])
+    for i, o, w in zip(inc, raan, aop):
+        coes = ClassicalElements(0, i, 0, o, w, 0)
+        p = coes.get_perigee_vector()
+        q = coes.get_semi_latis_rectum_vector()
+        for column, value in zip(columns, (p.x, p.y, p.z, q.x, q.y, q.z)):
+            column.append(value)
+    return columns
+
+def two_body_states(
+    rx:float, ry:float, rz:float, vx:float, vy:float, vz:float,
+    dt:typing.Sequence[float]
+) -> typing.Tuple[typing.List[float], ...]:
+    """Propagate a single state to each time offset with two-body motion
+
+    Follows equations 2.37, 2.43, and 2.44 from Satellite Orbits
+
+    Note:
+        The state must describe an elliptical orbit
+
+    Args:
+        rx, ry, rz:     components of the initial position in kilometers
+        vx, vy, vz:     components of the initial velocity in km/s
+        dt:             seconds elapsed since the initial state
+
+    Returns:
+        x, y, and z components of position followed by those of velocity
+
+    """
+    coes = ClassicalElements.from_position_and_velocity(
+        Vector3D(rx, ry, rz),
+        Vector3D(vx, vy, vz)
+    )
+
+    #Save values that do not change between epochs
+    p = coes.get_perigee_vector()
+    q = coes.get_semi_latis_rectum_vector()
+    n = coes.get_mean_motion()
+    e = coes.eccentricity
+    a = coes.semi_major_axis
+    root_one_minus_e2 = sqrt(1-e*e)
+
+    columns = ([], [], [], [], [], [])
+    for t in dt:
+
+        #Get mean anomaly after delta t (Equation 2.37)
+        ma = coes.mean_anomaly + n*t
+
+        #Solve eccentric anomaly
+        en = ClassicalElements.equation_to_eccentric_anomaly(ma, e)
+
+        #Solve position using equation 2.43
+        pScaled = p.scale(a*(cos(en) - e))
+        qScaled = q.scale(a*root_one_minus_e2*sin(en))
+        pos = pScaled.plus(qScaled)
+
+        #Solve velocity using equation 2.44
+        pScaled = p.scale(-sin(en))
+        qScaled = q.scale(root_one_minus_e2*cos(en))
+        multiple = sqrt(Earth.mu*a)/(a*(1 - e*cos(en)))
+        vel = pScaled.plus(qScaled).scale(multiple)
+
+        for column, value in zip(columns, (
+            pos.x, pos.y, pos.z, vel.x, vel.y, vel.z
+        )):
+            column.append(value)
+
+    return columns
@@ -1,6 +1,8 @@
+import typing
+
 from spacebar.astro.bodies import Earth
 from spacebar.math.linalg import Vector3D
-from math import atan2, sqrt, pi, sin, cos
+from math import atan2, sqrt, pi, sin, cos, isnan
 
 class ClassicalElements:
     
@@ -86,8 +88,10 @@ class ClassicalElements:
         #Solve mean motion (Eq. 2.61)
         n = sqrt(Earth.mu/a**3)
 
-        #Solve eccentricity (Eq. 2.62)
-        e = sqrt(1 - p/a)
+        #Solve eccentricity (Eq. 2.62), clamping rounding below zero to 
+        #circular
+        e_squared = 1 - p/a
+        e = 0.0 if e_squared < 0 else sqrt(e_squared)
 
         #Solve eccentric anomaly (Eq. 2.64)
         num = pos.dot(vel)/(a**2*n)
@@ -184,6 +188,40 @@ class ClassicalElements:
 
         return Vector3D(x, y, z).normalize()
 
+    def get_position_and_velocity(self) -> typing.Tuple[Vector3D, Vector3D]:
+        """get ECI position and velocity represented by the elements
+
+        Follows equations 2.43 and 2.44 from Satellite Orbits
+
+        Args:
+            None
+
+        Returns:
+            position and velocity of the satellite at the element epoch
+
+        """
+        a = self.semi_major_axis
+        e = self.eccentricity
+        ea = ClassicalElements.equation_to_eccentric_anomaly(
+            self.mean_anomaly, 
+            e
+        )
+        p = self.get_perigee_vector()
+        q = self.get_semi_latis_rectum_vector()
+
+        #Solve position using equation 2.43
+        pScaled = p.scale(a*(cos(ea) - e))
+        qScaled = q.scale(a*sqrt(1-e*e)*sin(ea))
+        pos = pScaled.plus(qScaled)
+
+        #Solve velocity using equation 2.44
+        pScaled = p.scale(-sin(ea))
+        qScaled = q.scale(sqrt(1-e*e)*cos(ea))
+        multiple = sqrt(Earth.mu*a)/(a*(1 - e*cos(ea)))
+        vel = pScaled.plus(qScaled).scale(multiple)
+
+        return pos, vel
+
     @staticmethod
     def equation_to_eccentric_anomaly(mean_anom:float, ecc:float) -> float:
         """Solve eccentric anomaly given eccentricity and mean anomaly 
@@ -220,8 +258,9 @@ class ClassicalElements:
             #Solve E sub i+1
             ea_n = ea_0 + num/den
 
-            #Check tolerance and reseed E sub i if difference is too large
-            if(abs(ea_n-ea_0) < 1e-12):
+            #Check tolerance and reseed E sub i if difference is too large.
+            #NaN never meets tolerance, so it also stops the iteration
+            if(abs(ea_n-ea_0) < 1e-12 or isnan(ea_n)):
                 converged = True
             else:
                 ea_0 = ea_n
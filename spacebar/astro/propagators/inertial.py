@@ -1,12 +1,12 @@
 import typing
 
 from copy import deepcopy
-from math import cos, sin, sqrt
+from math import inf, isfinite
 
 from spacebar.astro.bodies import Earth
 from spacebar.time.utc import UTC
 from spacebar.math.linalg import Vector3D
-from spacebar.astro.orbit.elements import ClassicalElements
+from spacebar.astro.kernels.backend import get_backend
 
 class TwoBody:
 
@@ -40,37 +40,65 @@ class TwoBody:
         Returns:
             new epoch, position, and velocity 
             """
+        return self.get_states_at_epochs([next_epoch])[0]
 
-        #Get the time difference in seconds
-        t = next_epoch.timestamp - self.epoch0.timestamp
+    def get_states_at_epochs(
+        self, next_epochs:typing.List[UTC]
+    ) -> typing.List[typing.Tuple[UTC, Vector3D, Vector3D]]:
+        """get future states of model for several epochs in a single pass
 
-        #Save the COEs of the given state vector
-        coes = ClassicalElements.from_position_and_velocity(
-            self.position0, 
-            self.velocity0
-        )
+        The classical elements and P/Q vectors only depend on the initial 
+        state, so they are solved once and reused for every requested epoch.
+        The math is evaluated by the backend selected with 
+        spacebar.astro.kernels.backend.set_backend
 
-        #Get mean anomaly after delta t (Equation 2.37)
-        ma = coes.mean_anomaly + coes.get_mean_motion()*t
+        Args:
+            next_epochs:    desired times of next states
 
-        #Get P and Q vectors
-        p = coes.get_perigee_vector()
-        q = coes.get_semi_latis_rectum_vector()
+        Returns:
+            new epoch, position, and velocity for each of next_epochs in the 
+            order they were given
 
-        #Solve eccentric anomaly
-        e = coes.eccentricity
-        en = ClassicalElements.equation_to_eccentric_anomaly(ma, e)
+        Raises:
+            ValueError:     initial position is zero or not finite, or the
+                            initial state does not describe an elliptical orbit
 
-        #Solve position using equation 2.43
-        a = coes.semi_major_axis
-        pScaled = p.scale(a*(cos(en) - e))
-        qScaled = q.scale(a*sqrt(1-e*e)*sin(en))
-        pos = pScaled.plus(qScaled)
+        """
 
-        #Solve velocity using equation 2.44
-        pScaled = p.scale(-sin(en))
-        qScaled = q.scale(sqrt(1-e*e)*cos(en))
-        multiple = sqrt(Earth.mu*a)/self.position0.magnitude()
-        vel = pScaled.plus(qScaled).scale(multiple)
+        #Check the semi-major axis and eccentricity (Eq. 2.59, 2.60, and 2.62)
+        #before dispatching, since backends do not all fail the same way
+        r = self.position0.magnitude()
+        if not (isfinite(r) and r > 0):
+            raise ValueError(
+                "TwoBody requires a finite, nonzero initial position, got "
+                "radius %s km" % r
+            )
+        energy = 2/r - self.velocity0.magnitude()**2/Earth.mu
+        a = 1/energy if energy != 0 else inf
+        p = self.position0.cross(self.velocity0).magnitude()**2/Earth.mu
+
+        #Rounding leaves p/a slightly above 1 for circular orbits
+        if not (isfinite(a) and a > 0 and 0 < p/a <= 1 + 1e-12):
+            raise ValueError(
+                "TwoBody requires an elliptical orbit, initial state has "
+                "semi-major axis %s km and semi-latus rectum %s km" % (a, p)
+            )
+
+        dt = [
+            next_epoch.timestamp - self.epoch0.timestamp
+            for next_epoch in next_epochs
+        ]
+        x, y, z, vx, vy, vz = get_backend().two_body_states(
+            self.position0.x, self.position0.y, self.position0.z,
+            self.velocity0.x, self.velocity0.y, self.velocity0.z,
+            dt
+        )
 
-        return next_epoch, pos, vel
+        return [
+            (
+                next_epochs[i],
+                Vector3D(float(x[i]), float(y[i]), float(z[i])),
+                Vector3D(float(vx[i]), float(vy[i]), float(vz[i]))
+            )
+            for i in range(len(next_epochs))
+        ]
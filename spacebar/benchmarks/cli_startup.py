@@ -0,0 +1,50 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+#These are the benchmark settings.  Each command is run this many times
+RUNS = 20
+
+STATES = (
+    "id,epoch,x,y,z,vx,vy,vz\n"
+    "1,Mar 06 2022 00:00:00.000,42164,0,700,0,3.075,0\n"
+)
+
+def time_command(command:list) -> list:
+    """run a command repeatedly and return its wall times in seconds"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+def run():
+
+    with tempfile.TemporaryDirectory() as directory:
+        states = os.path.join(directory, "states.csv")
+        with open(states, "w") as f:
+            f.write(STATES)
+
+        #The interpreter alone is the floor any entry point can reach
+        commands = {
+            "interpreter": [sys.executable, "-c", "pass"],
+            "import cli": [sys.executable, "-c", "import spacebar.cli"],
+            "--help": [sys.executable, "-m", "spacebar.cli", "--help"],
+            "one state, 1 day": [
+                sys.executable, "-m", "spacebar.cli", states
+            ],
+        }
+
+        print("%-20s %10s %10s" % ("command", "median ms", "min ms"))
+        for name, command in commands.items():
+            times = time_command(command)
+            print("%-20s %10.2f %10.2f" % (
+                name, 1e3*statistics.median(times), 1e3*min(times)
+            ))
+
+if __name__=="__main__":
+    run()
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import random
+import time
+
+from spacebar.time.utc import UTC
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.propagators.inertial import TwoBody
+from spacebar.service.propagation import PropagationServer
+
+#These are the load settings.  Every client asks for a shared set of epochs
+CATALOG_SIZE = 100
+CLIENTS = 20
+REQUESTS_PER_CLIENT = 500
+IN_FLIGHT_PER_CLIENT = 8
+EPOCHS_IN_GRID = 24
+START = UTC("Mar 06 2022 00:00:00.000")
+
+def build_catalog(size:int) -> dict:
+    """create a catalog of near-geosynchronous objects with varied states"""
+    rng = random.Random(0)
+    catalog = {}
+    for i in range(size):
+        x = 42164 + rng.uniform(-500, 500)
+        z = rng.uniform(-700, 700)
+        position = Vector3D(x, 0, z)
+        velocity = Vector3D(0, 3.075 + rng.uniform(-.01, .01), 0)
+        catalog[str(i)] = TwoBody(START, position, velocity)
+    return catalog
+
+async def client(host:str, port:int, seed:int, latencies:list) -> None:
+    """keep a fixed number of requests in flight and record each latency"""
+    rng = random.Random(seed)
+    epochs = [
+        START.plus_seconds(3600*h).to_string() for h in range(EPOCHS_IN_GRID)
+    ]
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = {}
+
+    def send(ref:int) -> None:
+        request = {
+            "ref": ref,
+            "id": str(rng.randrange(CATALOG_SIZE)),
+            "epoch": rng.choice(epochs)
+        }
+        sent[ref] = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+
+    #Each response frees a slot for the next request
+    next_ref = min(IN_FLIGHT_PER_CLIENT, REQUESTS_PER_CLIENT)
+    for ref in range(next_ref):
+        send(ref)
+    for _ in range(REQUESTS_PER_CLIENT):
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - sent.pop(response["ref"]))
+        if next_ref < REQUESTS_PER_CLIENT:
+            send(next_ref)
+            next_ref += 1
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+async def main() -> None:
+
+    server = PropagationServer(build_catalog(CATALOG_SIZE))
+    host, port = await server.start()
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[client(host, port, seed, latencies) for seed in range(CLIENTS)]
+    )
+    elapsed = time.perf_counter() - start
+    stats = server.counters.to_dict()
+    await server.stop()
+
+    latencies.sort()
+    print("requests:            %d" % len(latencies))
+    print("wall time (s):       %.3f" % elapsed)
+    print("throughput (req/s):  %.1f" % (len(latencies)/elapsed))
+    print("p50 latency (ms):    %.3f" % (1e3*latencies[len(latencies)//2]))
+    p99 = latencies[int(len(latencies)*.99)]
+    print("p99 latency (ms):    %.3f" % (1e3*p99))
+    print("batches:             %d" % stats["batches"])
+    print("mean batch size:     %.1f" % stats["mean_batch_size"])
+    print("propagations:        %d" % stats["propagations"])
+
+def run():
+    asyncio.run(main())
+
+if __name__=="__main__":
+    run()
@@ -0,0 +1,281 @@
+import sys
+import typing
+
+#Only sys and typing are imported at module load.  Everything else is imported
+#where it is used so that --help and small jobs start quickly.
+if typing.TYPE_CHECKING:
+    import argparse
+
+    from spacebar.time.utc import UTC
+    from spacebar.math.linalg import Vector3D
+
+STATE_COLUMNS = ["id", "epoch", "x", "y", "z", "vx", "vy", "vz"]
+ELEMENT_COLUMNS = ["id", "epoch", "sma", "inc", "ecc", "raan", "aop", "ma"]
+
+#Binary records are object index, posix time, position, and velocity
+BINARY_RECORD_FORMAT = "<Id6d"
+
+#Number of grid epochs propagated before output is written
+CHUNK_SIZE = 1024
+
+def build_parser() -> "argparse.ArgumentParser":
+    """create the argument parser for the batch propagation tool"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="spacebar-propagate",
+        description=(
+            "Propagate initial states or classical elements over a time grid "
+            "and stream the resulting ephemerides."
+        ),
+        epilog=(
+            "State files are CSV with columns %s.  Element files are CSV "
+            "with columns %s, angles in radians.  Epochs use the "
+            "'Mmm DD YYYY hh:mm:ss.ssssss' format.  Binary records are "
+            "little-endian '%s' (input row index, posix time, x, y, z, vx, "
+            "vy, vz)." % (
+                ",".join(STATE_COLUMNS),
+                ",".join(ELEMENT_COLUMNS),
+                BINARY_RECORD_FORMAT
+            )
+        )
+    )
+    parser.add_argument(
+        "inputs", nargs="*", default=["-"],
+        help="state or element files, '-' reads stdin (default)"
+    )
+    parser.add_argument(
+        "--start", default=None,
+        help="first epoch of the grid (default: each record's epoch)"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=86400.0,
+        help="length of the grid in seconds (default: 86400)"
+    )
+    parser.add_argument(
+        "--step", type=float, default=600.0,
+        help="spacing of the grid in seconds (default: 600)"
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "binary"], default="csv",
+        help="ephemeris output format (default: csv)"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="output file, '-' writes stdout (default)"
+    )
+    return parser
+
+def read_records(
+    stream:typing.TextIO
+) -> typing.Iterator[typing.Tuple[str, "UTC", "Vector3D", "Vector3D"]]:
+    """read initial states from a state or element CSV stream
+
+    The file type is detected from its header row
+
+    Args:
+        stream:     text stream containing CSV rows with a header
+
+    Returns:
+        iterator of identifier, epoch, position, and velocity for each row
+
+    """
+    import csv
+
+    from spacebar.time.utc import UTC
+    from spacebar.math.linalg import Vector3D
+
+    reader = csv.DictReader(stream)
+    columns = set(reader.fieldnames or [])
+    if set(STATE_COLUMNS) <= columns:
+        for row in reader:
+            pos = Vector3D(*[float(row[c]) for c in STATE_COLUMNS[2:5]])
+            vel = Vector3D(*[float(row[c]) for c in STATE_COLUMNS[5:8]])
+            yield row["id"], UTC(row["epoch"]), pos, vel
+    elif set(ELEMENT_COLUMNS) <= columns:
+        from spacebar.astro.orbit.elements import ClassicalElements
+        for row in reader:
+            coes = ClassicalElements(
+                float(row["sma"]),
+                float(row["inc"]),
+                float(row["ecc"]),
+                float(row["raan"]),
+                float(row["aop"]),
+                float(row["ma"])
+            )
+            pos, vel = coes.get_position_and_velocity()
+            yield row["id"], UTC(row["epoch"]), pos, vel
+    else:
+        raise ValueError(
+            "unrecognized header %s, expected state columns %s or element "
+            "columns %s" % (
+                ",".join(reader.fieldnames or []),
+                ",".join(STATE_COLUMNS),
+                ",".join(ELEMENT_COLUMNS)
+            )
+        )
+
+class CSVWriter:
+
+    def __init__(self, stream:typing.TextIO) -> None:
+        """Class used to stream ephemerides as CSV rows
+
+        Args:
+            stream:     text stream the rows will be written to
+
+        Returns:
+            None
+
+        """
+        import csv
+        self.stream = stream
+        self.writer = csv.writer(stream, lineterminator="\n")
+        self.writer.writerow(STATE_COLUMNS)
+
+    def write(
+        self, index:int, sat_id:str,
+        states:typing.List[typing.Tuple["UTC", "Vector3D", "Vector3D"]]
+    ) -> None:
+        """write the states of a single object
+
+        Args:
+            index:      row index of the object in the inputs
+            sat_id:     identifier of the object
+            states:     epoch, position, and velocity tuples
+
+        Returns:
+            None
+
+        """
+        self.writer.writerows(
+            (
+                sat_id, epoch.to_string(),
+                repr(pos.x), repr(pos.y), repr(pos.z),
+                repr(vel.x), repr(vel.y), repr(vel.z)
+            ) for epoch, pos, vel in states
+        )
+
+class BinaryWriter:
+
+    def __init__(self, stream:typing.BinaryIO) -> None:
+        """Class used to stream ephemerides as packed binary records
+
+        Args:
+            stream:     binary stream the records will be written to
+
+        Returns:
+            None
+
+        """
+        import struct
+        self.stream = stream
+        self.record = struct.Struct(BINARY_RECORD_FORMAT)
+
+    def write(
+        self, index:int, sat_id:str,
+        states:typing.List[typing.Tuple["UTC", "Vector3D", "Vector3D"]]
+    ) -> None:
+        """write the states of a single object
+
+        Args:
+            index:      row index of the object in the inputs
+            sat_id:     identifier of the object
+            states:     epoch, position, and velocity tuples
+
+        Returns:
+            None
+
+        """
+        self.stream.write(b"".join(
+            self.record.pack(
+                index, epoch.timestamp,
+                pos.x, pos.y, pos.z, vel.x, vel.y, vel.z
+            ) for epoch, pos, vel in states
+        ))
+
+def propagate(
+    args:"argparse.Namespace", output:typing.Union[CSVWriter, BinaryWriter]
+) -> None:
+    """propagate every input record over the grid and write the states
+
+    Args:
+        args:       parsed command line arguments
+        output:     CSVWriter or BinaryWriter receiving the states
+
+    Returns:
+        None
+
+    """
+    from spacebar.time.utc import UTC
+    from spacebar.astro.propagators.inertial import TwoBody
+
+    start = UTC(args.start) if args.start is not None else None
+    steps = int(args.duration//args.step) + 1
+
+    index = 0
+    for path in args.inputs:
+        stream = sys.stdin if path == "-" else open(path, newline="")
+        try:
+            for sat_id, epoch, pos, vel in read_records(stream):
+                propagator = TwoBody(epoch, pos, vel)
+                grid_start = start if start is not None else epoch
+                for first in range(0, steps, CHUNK_SIZE):
+                    epochs = [
+                        grid_start.plus_seconds(k*args.step)
+                        for k in range(first, min(first + CHUNK_SIZE, steps))
+                    ]
+                    output.write(
+                        index, sat_id, propagator.get_states_at_epochs(epochs)
+                    )
+                index += 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+def main(argv:typing.Optional[typing.List[str]]=None) -> int:
+    """console entry point for the batch propagation tool
+
+    Args:
+        argv:       command line arguments, defaults to sys.argv[1:]
+
+    Returns:
+        process exit code
+
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.step <= 0:
+        parser.error("--step must be positive")
+    if args.duration < 0:
+        parser.error("--duration must not be negative")
+
+    binary = args.format == "binary"
+    if args.output == "-":
+        stream = sys.stdout.buffer if binary else sys.stdout
+    else:
+        stream = open(args.output, "wb") if binary else open(
+            args.output, "w", newline=""
+        )
+
+    try:
+        output = BinaryWriter(stream) if binary else CSVWriter(stream)
+        propagate(args, output)
+        if args.output == "-":
+            stream.flush()
+    except BrokenPipeError:
+
+        #The reader went away (e.g. piped into head).  Point stdout at
+        #devnull so the flush at interpreter exit does not raise again
+        import os
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except (OSError, ValueError, TypeError, ArithmeticError) as err:
+        parser.exit(1, "%s: error: %s\n" % (parser.prog, err))
+    finally:
+        if args.output != "-":
+            stream.close()
+
+    return 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,527 @@
+import asyncio
+import json
+import time
+import typing
+
+from spacebar.time.utc import UTC
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.propagators.inertial import TwoBody
+
+#Queued request: object identifier, epoch, future, and time it was queued
+Request = typing.Tuple[str, UTC, asyncio.Future, float]
+
+#Future waiting on a state and the time its request was queued
+Waiter = typing.Tuple[asyncio.Future, float]
+
+#Unique epochs requested for a single object and the waiters on each
+EpochWaiters = typing.List[typing.Tuple[UTC, typing.List[Waiter]]]
+
+#Requests of a batch keyed by object identifier and then by posix time
+GroupedBatch = typing.Dict[
+    str, typing.Dict[float, typing.Tuple[UTC, typing.List[Waiter]]]
+]
+
+#Epoch waiters of an object with either its states or the error raised
+BatchResult = typing.Tuple[
+    EpochWaiters,
+    typing.Optional[typing.List[typing.Tuple[UTC, Vector3D, Vector3D]]],
+    typing.Optional[Exception]
+]
+
+class ServiceCounters:
+
+    def __init__(self) -> None:
+        """Class used to track latency and throughput of a propagation service
+
+        Note:
+            Latencies are measured in seconds from the moment a request is
+            queued until its state is solved
+
+        Attributes:
+            requests:       number of state requests received
+            failures:       number of requests that could not be served
+            completed:      number of requests whose latency was recorded
+            batched:        number of requests that reached a micro-batch
+            batches:        number of micro-batches propagated
+            propagations:   number of unique object/epoch pairs propagated
+            total_latency:  sum of latencies for all completed requests
+            max_latency:    largest latency seen for a single request
+            start_time:     performance counter value at creation
+
+        Returns:
+            None
+
+        """
+        self.requests = 0
+        self.failures = 0
+        self.completed = 0
+        self.batched = 0
+        self.batches = 0
+        self.propagations = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.start_time = time.perf_counter()
+
+    def record_batch(self, size:int, propagations:int) -> None:
+        """add a completed micro-batch to the counters
+
+        Args:
+            size:           number of requests coalesced into the batch
+            propagations:   unique object/epoch pairs solved for the batch
+
+        Returns:
+            None
+
+        """
+        self.requests += size
+        self.batched += size
+        self.batches += 1
+        self.propagations += propagations
+
+    def record_latency(self, latency:float, failed:bool=False) -> None:
+        """add the latency of a single completed request to the counters
+
+        Args:
+            latency:    seconds between queueing and solving the request
+            failed:     flag indicating the request could not be served
+
+        Returns:
+            None
+
+        """
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if failed:
+            self.failures += 1
+
+    def record_rejected(self, count:int=1) -> None:
+        """add requests that failed before reaching a micro-batch
+
+        Args:
+            count:      number of requests that could not be served
+
+        Returns:
+            None
+
+        """
+        self.requests += count
+        self.failures += count
+
+    def to_dict(self) -> typing.Dict[str, float]:
+        """get a snapshot of the counters and the statistics derived from them
+
+        Args:
+            None
+
+        Returns:
+            dictionary of raw counters, mean latency, mean batch size, and
+            throughput in requests per second
+
+        """
+        uptime = time.perf_counter() - self.start_time
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "batches": self.batches,
+            "propagations": self.propagations,
+            "mean_latency": self.total_latency/max(self.completed, 1),
+            "max_latency": self.max_latency,
+            "mean_batch_size": self.batched/max(self.batches, 1),
+            "throughput": self.requests/uptime if uptime > 0 else 0.0,
+            "uptime": uptime
+        }
+
+class PropagationServer:
+
+    #Seconds to discard input after a line over the stream limit
+    DISCARD_TIMEOUT = 1.0
+
+    def __init__(
+        self, catalog:typing.Dict[str, TwoBody], batch_window:float=.001,
+        max_batch_size:int=256, max_pending:int=1024
+    ) -> None:
+        """Class used to serve catalog states over a local socket
+
+        Requests arriving within batch_window of each other are coalesced into
+        a micro-batch.  Each object in the batch is then propagated once for
+        all of its unique requested epochs.  Batches are solved in the default
+        executor so sockets are serviced while a batch is propagated.
+
+        Note:
+            The wire protocol is newline-delimited JSON.  A state request
+            looks like {"id": "25544", "epoch": "Mar 04 2022 04:42:42.000"}
+            and a counter request looks like {"op": "stats"}.  Any "ref" value
+            in a request is echoed in its response so clients may pipeline.
+
+        Args:
+            catalog:        propagators keyed by object identifier
+            batch_window:   seconds to wait for more requests before solving
+            max_batch_size: largest number of requests in a single batch
+            max_pending:    most unanswered requests read from one client
+
+        Attributes:
+            catalog:        propagators keyed by object identifier
+            batch_window:   seconds to wait for more requests before solving
+            max_batch_size: largest number of requests in a single batch
+            max_pending:    most unanswered requests read from one client
+            counters:       latency and throughput counters for the service
+
+        Returns:
+            None
+
+        """
+        self.catalog = catalog
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.counters = ServiceCounters()
+        self._queue = None
+        self._batch_task = None
+        self._server = None
+        self._in_flight: typing.List[Request] = []
+        self._writers: typing.Set[asyncio.StreamWriter] = set()
+
+    async def start(
+        self, host:str="127.0.0.1", port:int=0
+    ) -> typing.Tuple[str, int]:
+        """begin accepting requests
+
+        Args:
+            host:   interface the socket will be bound to
+            port:   port the socket will be bound to, 0 selects a free port
+
+        Returns:
+            host and port the service is listening on
+
+        """
+        self._start_batching()
+        self._server = await asyncio.start_server(
+            self._handle_client, host, port
+        )
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        """stop accepting requests, cancel the batching loop, and disconnect
+
+        Requests that have not been solved fail with ConnectionAbortedError
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        if self._server is not None:
+            self._server.close()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+
+        #Fail the batch being solved and anything still waiting in the queue
+        pending = self._in_flight
+        self._in_flight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, _, future, _ in pending:
+            if not future.done():
+                future.set_exception(
+                    ConnectionAbortedError("propagation server stopped")
+                )
+        self.counters.record_rejected(len(pending))
+
+        #Connections must be closed before wait_closed can return
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def request_state(
+        self, sat_id:str, epoch:UTC
+    ) -> typing.Tuple[UTC, Vector3D, Vector3D]:
+        """get the state of a catalog object through the batching queue
+
+        Args:
+            sat_id:     identifier of the object in the catalog
+            epoch:      desired time of the state
+
+        Returns:
+            epoch, position, and velocity of the object
+
+        """
+        self._start_batching()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sat_id, epoch, future, time.perf_counter()))
+        return await future
+
+    def _start_batching(self) -> None:
+        """create the request queue and batching loop if not yet running
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        if self._batch_task is None:
+            self._queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_loop())
+
+    async def _batch_loop(self) -> None:
+        """gather queued requests into micro-batches and solve them
+
+        Runs until cancelled by stop.  Each batch is solved in the default
+        executor and its futures are resolved back on the event loop.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        while True:
+
+            #Wait for a request, then give others a window to join the batch.
+            #The batch is kept on self so stop can fail it if cancelled
+            batch = self._in_flight = [await self._queue.get()]
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            #Group futures by object and then by epoch so duplicates share a
+            #state, then solve off the event loop
+            grouped: GroupedBatch = {}
+            for sat_id, epoch, future, queued in batch:
+                epochs = grouped.setdefault(sat_id, {})
+                epochs.setdefault(epoch.timestamp, (epoch, []))[1].append(
+                    (future, queued)
+                )
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, self._solve_batch, grouped
+            )
+            self._in_flight = []
+            self._resolve_batch(len(batch), results)
+
+    def _solve_batch(self, grouped:GroupedBatch) -> typing.List[BatchResult]:
+        """propagate each object once for all of its requested epochs
+
+        Note:
+            Runs in the default executor, so it must not touch the futures
+
+        Args:
+            grouped:    requests of the batch keyed by object and posix time
+
+        Returns:
+            epoch waiters of each object with its states, or with the error
+            raised when the object is unknown or could not be propagated
+
+        """
+        results = []
+        for sat_id, epochs in grouped.items():
+            waiters = list(epochs.values())
+            states = None
+            error = None
+            if sat_id not in self.catalog:
+                error = KeyError("unknown object %s" % sat_id)
+            else:
+                try:
+                    states = self.catalog[sat_id].get_states_at_epochs(
+                        [epoch for epoch, _ in waiters]
+                    )
+                except Exception as err:
+                    error = err
+            results.append((waiters, states, error))
+        return results
+
+    def _resolve_batch(
+        self, size:int, results:typing.List[BatchResult]
+    ) -> None:
+        """hand solved states to the futures waiting on them
+
+        Args:
+            size:       number of requests coalesced into the batch
+            results:    output of _solve_batch for the batch
+
+        Returns:
+            None
+
+        """
+        propagations = 0
+        for waiters, states, error in results:
+            if states is not None:
+                propagations += len(states)
+            for i, (_, requests) in enumerate(waiters):
+                for future, queued in requests:
+                    self.counters.record_latency(
+                        time.perf_counter() - queued, states is None
+                    )
+                    if future.done():
+                        continue
+                    if states is None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(states[i])
+
+        self.counters.record_batch(size, propagations)
+
+    async def _handle_client(
+        self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter
+    ) -> None:
+        """read requests from a client and answer each as it is solved
+
+        A line longer than the stream limit is answered with an error after
+        earlier requests are answered.  The connection is then closed, since
+        the rest of the stream cannot be framed reliably.  Unread input is
+        discarded for up to DISCARD_TIMEOUT seconds first so the error is
+        not lost to a connection reset.
+
+        Args:
+            reader:     stream the client's requests are read from
+            writer:     stream the responses are written to
+
+        Returns:
+            None
+
+        """
+        self._writers.add(writer)
+
+        #Reading pauses once max_pending requests are unanswered
+        pending = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+        overrun = None
+        try:
+            while True:
+                await pending.acquire()
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    line = b""
+                except (ValueError, asyncio.LimitOverrunError) as err:
+                    overrun = err
+                    line = b""
+                if not line:
+                    pending.release()
+                    break
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: pending.release())
+            if tasks:
+                await asyncio.gather(*tasks)
+            if overrun is not None:
+                await self._reject_overrun(reader, writer, overrun)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _answer(self, line:bytes, writer:asyncio.StreamWriter) -> None:
+        """solve a single wire request and write its response
+
+        Args:
+            line:       newline-delimited JSON request read from the client
+            writer:     stream the response is written to
+
+        Returns:
+            None
+
+        """
+        response: typing.Dict[str, typing.Any] = {}
+        try:
+            request = json.loads(line)
+            response["ref"] = request.get("ref")
+            if request.get("op") == "stats":
+                response["stats"] = self.counters.to_dict()
+            else:
+                sat_id = str(request["id"])
+                next_epoch = UTC(request["epoch"])
+        except Exception as err:
+            self.counters.record_rejected()
+            response["error"] = "%s: %s" % (type(err).__name__, err)
+
+        if "stats" not in response and "error" not in response:
+            try:
+                epoch, pos, vel = await self.request_state(sat_id, next_epoch)
+                response["id"] = sat_id
+                response["epoch"] = epoch.to_string()
+                response["position"] = [pos.x, pos.y, pos.z]
+                response["velocity"] = [vel.x, vel.y, vel.z]
+            except Exception as err:
+                response["error"] = "%s: %s" % (type(err).__name__, err)
+
+        if self._write_response(writer, response):
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _reject_overrun(
+        self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter,
+        err:Exception
+    ) -> None:
+        """answer a line over the stream limit and shut down the connection
+
+        Args:
+            reader:     stream the client's requests are read from
+            writer:     stream the responses are written to
+            err:        error raised while reading the line
+
+        Returns:
+            None
+
+        """
+        self.counters.record_rejected()
+        if not self._write_response(writer, {
+            "ref": None,
+            "error": "%s: %s" % (type(err).__name__, err)
+        }):
+            return
+        try:
+            await writer.drain()
+            if writer.can_write_eof():
+                writer.write_eof()
+            await asyncio.wait_for(
+                self._discard_input(reader), self.DISCARD_TIMEOUT
+            )
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+
+    @staticmethod
+    async def _discard_input(reader:asyncio.StreamReader) -> None:
+        """read and drop input until the client closes its side
+
+        Args:
+            reader:     stream the client's requests are read from
+
+        Returns:
+            None
+
+        """
+        while await reader.read(2**16):
+            pass
+
+    def _write_response(
+        self, writer:asyncio.StreamWriter, response:typing.Dict[str, typing.Any]
+    ) -> bool:
+        """write a single JSON response line if the client is still connected
+
+        Args:
+            writer:     stream the response is written to
+            response:   JSON-serializable response
+
+        Returns:
+            True if the response was written, False if the stream is closing
+
+        """
+        if writer.is_closing():
+            return False
+        writer.write(json.dumps(response).encode() + b"\n")
+        return True
@@ -0,0 +1,202 @@
+import math
+import random
+import sys
+import types
+import unittest
+import unittest.mock as mk
+import warnings
+
+from spacebar.astro.bodies import Earth
+from spacebar.astro.kernels import backend
+from spacebar.astro.kernels import python_kernels
+from spacebar.time.utc import UTC
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.propagators.inertial import TwoBody
+
+AVAILABLE = backend.available_backends()
+
+class BackendConsistency:
+    """
+    Mixin comparing a backend against the python reference backend
+    """
+
+    NAME = None
+
+    #Position and velocity of each test state
+    STATES = [
+        (10000, 40000, -5000, -1.5, 1, -.1),
+        (42164, 0, 0, 0, 3.075, 0),
+        (42164, 0, 700, 0, 3.075, 0),
+        (7000, 0, 0, 0, 7.5, 1),
+        (6678, 100, -200, .5, 10.4, .3),
+    ]
+
+    def setUp(self):
+        self.kernels = backend.load_backend(self.NAME)
+        rng = random.Random(0)
+        self.mean_anom = [rng.uniform(0, 6.28) for _ in range(200)]
+        self.ecc = [rng.uniform(0, .95) for _ in range(200)]
+        self.columns = list(zip(*self.STATES))
+
+    def assertColumnsAlmostEqual(self, expected, actual, places):
+        self.assertEqual(len(expected), len(actual))
+        for e_column, a_column in zip(expected, actual):
+            self.assertEqual(len(e_column), len(a_column))
+            for e, a in zip(e_column, a_column):
+                self.assertAlmostEqual(e, float(a), places)
+
+    def test_eccentric_anomaly(self):
+        """
+        Test eccentric anomaly against the python backend
+        """
+        expected = python_kernels.eccentric_anomaly(self.mean_anom, self.ecc)
+        actual = self.kernels.eccentric_anomaly(self.mean_anom, self.ecc)
+        self.assertColumnsAlmostEqual([expected], [actual], 9)
+
+    def test_elements_from_state(self):
+        """
+        Test classical elements against the python backend
+        """
+        expected = python_kernels.elements_from_state(*self.columns)
+        actual = self.kernels.elements_from_state(*self.columns)
+        self.assertColumnsAlmostEqual(expected, actual, 6)
+
+    def test_pq_vectors(self):
+        """
+        Test P and Q vectors against the python backend
+        """
+        coes = python_kernels.elements_from_state(*self.columns)
+        inc, raan, aop = coes[1], coes[3], coes[4]
+        expected = python_kernels.pq_vectors(inc, raan, aop)
+        actual = self.kernels.pq_vectors(inc, raan, aop)
+        self.assertColumnsAlmostEqual(expected, actual, 12)
+
+    def test_two_body_states(self):
+        """
+        Test two-body propagation against the python backend
+        """
+        dt = [600.0*k for k in range(-10, 145)]
+        for state in self.STATES:
+            expected = python_kernels.two_body_states(*state, dt)
+            actual = self.kernels.two_body_states(*state, dt)
+            self.assertColumnsAlmostEqual(expected, actual, 6)
+
+    def test_two_body_energy(self):
+        """
+        Test that two-body propagation conserves specific orbital energy
+        """
+        dt = [600.0*k for k in range(-10, 145)]
+        for state in self.STATES + [(7000, 0, 0, 0, 8.56, 0)]:
+            r0 = math.sqrt(sum(c**2 for c in state[:3]))
+            v0 = math.sqrt(sum(c**2 for c in state[3:]))
+            energy = v0**2/2 - Earth.mu/r0
+            x, y, z, vx, vy, vz = self.kernels.two_body_states(*state, dt)
+            for i in range(len(dt)):
+                r = math.sqrt(x[i]**2 + y[i]**2 + z[i]**2)
+                v = math.sqrt(vx[i]**2 + vy[i]**2 + vz[i]**2)
+                self.assertAlmostEqual(energy, v**2/2 - Earth.mu/r, 6)
+
+    def test_invalid_input(self):
+        """
+        Test that non-elliptical states are rejected by TwoBody for every
+        backend, that circular states are accepted, and that NaN does not
+        stall the Kepler iteration
+        """
+        actual = self.kernels.eccentric_anomaly([float("nan")], [.5])
+        self.assertTrue(math.isnan(actual[0]))
+
+        epoch = UTC("Mar 04 2022 04:42:42.000")
+        later = epoch.plus_seconds(1000)
+        escape = math.sqrt(2*Earth.mu/8000)
+        invalid = [
+            TwoBody(epoch, Vector3D(7000, 0, 0), Vector3D(0, 12, 0)),
+            TwoBody(epoch, Vector3D(7000, 0, 0), Vector3D(3, 0, 0)),
+            TwoBody(epoch, Vector3D(0, 0, 0), Vector3D(0, 0, 0)),
+            TwoBody(epoch, Vector3D(8000, 0, 0), Vector3D(0, escape, 0)),
+        ]
+        try:
+            backend.set_backend(self.NAME)
+            for tb in invalid:
+                with self.assertRaises(ValueError):
+                    tb.get_state_at_epoch(epoch)
+
+            #Rounding leaves p/a slightly above 1 for many circular states
+            for r in range(6600, 45001, 37):
+                vel = Vector3D(0, math.sqrt(Earth.mu/r), 0)
+                tb = TwoBody(epoch, Vector3D(r, 0, 0), vel)
+                _, pos, _ = tb.get_state_at_epoch(later)
+                self.assertAlmostEqual(1, pos.magnitude()/r, 6)
+        finally:
+            backend.set_backend("python")
+
+    def test_two_body_propagator(self):
+        """
+        Test TwoBody propagation with the backend selected
+        """
+        epoch = UTC("Mar 04 2022 04:42:42.000")
+        epochs = [epoch.plus_seconds(3600*h) for h in range(24)]
+        pos = Vector3D(10000, 40000, -5000)
+        vel = Vector3D(-1.5, 1, -.1)
+        tb = TwoBody(epoch, pos, vel)
+        try:
+            backend.set_backend("python")
+            expected = tb.get_states_at_epochs(epochs)
+            backend.set_backend(self.NAME)
+            actual = tb.get_states_at_epochs(epochs)
+        finally:
+            backend.set_backend("python")
+        for (_, pos, vel), (_, pos1, vel1) in zip(expected, actual):
+            self.assertAlmostEqual(pos.x, pos1.x, 6)
+            self.assertAlmostEqual(pos.z, pos1.z, 6)
+            self.assertAlmostEqual(vel.y, vel1.y, 9)
+
+class TestPythonBackend(BackendConsistency, unittest.TestCase):
+    NAME = "python"
+
+@unittest.skipUnless("numpy" in AVAILABLE, "numpy is not installed")
+class TestNumpyBackend(BackendConsistency, unittest.TestCase):
+    NAME = "numpy"
+
+@unittest.skipUnless("numba" in AVAILABLE, "numba is not installed")
+class TestNumbaBackend(BackendConsistency, unittest.TestCase):
+    NAME = "numba"
+
+class TestBackendSelection(unittest.TestCase):
+
+    def tearDown(self):
+        backend.set_backend("python")
+
+    def test_unknown_backend(self):
+        """
+        Test that an unknown backend name is rejected
+        """
+        with self.assertRaises(ValueError):
+            backend.set_backend("fortran")
+
+    def test_fallback(self):
+        """
+        Test that a missing backend falls back with a warning
+        """
+        missing = {
+            "numba": "spacebar.astro.kernels.missing",
+            "numpy": "spacebar.astro.kernels.missing"
+        }
+        with mk.patch.dict(backend.BACKENDS, missing):
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual("python", backend.set_backend("numba"))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self.assertEqual("python", backend.set_backend("auto"))
+        self.assertEqual("python", backend.get_backend_name())
+
+    def test_environment_variable(self):
+        """
+        Test that the environment variable selects the first backend
+        """
+        stub = types.ModuleType("stub_kernels")
+        with mk.patch.dict(sys.modules, {"stub_kernels": stub}), \
+                mk.patch.dict(backend.BACKENDS, {"numpy": "stub_kernels"}), \
+                mk.patch.dict("os.environ", {"SPACEBAR_BACKEND": "numpy"}), \
+                mk.patch.object(backend, "_active_module", None):
+            self.assertIs(stub, backend.get_backend())
+            self.assertEqual("numpy", backend.get_backend_name())
@@ -23,3 +23,19 @@ class TestClassicalElements(unittest.TestCase):
         self.assertAlmostEqual(173.290, degrees(coes.raan), 3)
         self.assertAlmostEqual(91.553, degrees(coes.arg_of_perigee), 3)
         self.assertAlmostEqual(144.225, degrees(coes.mean_anomaly), 3)
+
+    def test_get_position_and_velocity(self):
+        """
+        Test that the state solved from classical elements matches the state 
+        the elements were created from
+        """
+        pos = Vector3D(10000, 40000, -5000)
+        vel = Vector3D(-1.5, 1, -.1)
+        coes = ClassicalElements.from_position_and_velocity(pos, vel)
+        pos1, vel1 = coes.get_position_and_velocity()
+        self.assertAlmostEqual(pos.x, pos1.x, 6)
+        self.assertAlmostEqual(pos.y, pos1.y, 6)
+        self.assertAlmostEqual(pos.z, pos1.z, 6)
+        self.assertAlmostEqual(vel.x, vel1.x, 9)
+        self.assertAlmostEqual(vel.y, vel1.y, 9)
+        self.assertAlmostEqual(vel.z, vel1.z, 9)
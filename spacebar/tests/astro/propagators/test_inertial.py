@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 from spacebar.time.utc import UTC
 from spacebar.astro.propagators.inertial import TwoBody
 from spacebar.math.linalg import Vector3D
+from spacebar.astro.orbit.elements import ClassicalElements
 
 class TestTwoBody(unittest.TestCase):
 
@@ -30,3 +31,28 @@ class TestTwoBody(unittest.TestCase):
 
         plt.plot(x, y)
         plt.show()
+
+    def test_get_states_at_epochs(self):
+        """
+        Test batch propagation against states computed independently from
+        the classical elements of the initial state
+        """
+        tb = TwoBody(self.START_EPOCH, self.START_POSITION, self.START_VELOCITY)
+        epochs = [self.START_EPOCH.plus_seconds(t*3600) for t in range(24)]
+        states = tb.get_states_at_epochs(epochs)
+        self.assertEqual(len(epochs), len(states))
+
+        coes = ClassicalElements.from_position_and_velocity(
+            self.START_POSITION, self.START_VELOCITY
+        )
+        ma0 = coes.mean_anomaly
+        for epoch, (_, pos, vel) in zip(epochs, states):
+            t = epoch.timestamp - self.START_EPOCH.timestamp
+            coes.mean_anomaly = ma0 + coes.get_mean_motion()*t
+            pos1, vel1 = coes.get_position_and_velocity()
+            self.assertAlmostEqual(pos1.x, pos.x, 6)
+            self.assertAlmostEqual(pos1.y, pos.y, 6)
+            self.assertAlmostEqual(pos1.z, pos.z, 6)
+            self.assertAlmostEqual(vel1.x, vel.x, 9)
+            self.assertAlmostEqual(vel1.y, vel.y, 9)
+            self.assertAlmostEqual(vel1.z, vel.z, 9)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import unittest
+import unittest.mock as mk
+
+from spacebar.time.utc import UTC
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.propagators.inertial import TwoBody
+from spacebar.service.propagation import PropagationServer
+
+class TestPropagationServer(unittest.TestCase):
+
+    START_EPOCH = UTC("Mar 04 2022 04:42:42.000")
+    END_EPOCH = "Mar 04 2022 10:42:42.000"
+    START_POSITION = Vector3D(42164, 0, 0)
+    START_VELOCITY = Vector3D(0, 3.075, 0)
+
+    def setUp(self):
+        self.propagator = TwoBody(
+            self.START_EPOCH, self.START_POSITION, self.START_VELOCITY
+        )
+        self.catalog = {"1": self.propagator}
+
+    def test_request_coalescing(self):
+        """
+        Test that concurrent requests share a batch and duplicate epochs are
+        only propagated once
+        """
+        async def run():
+            server = PropagationServer(self.catalog, batch_window=.01)
+            epoch = UTC(self.END_EPOCH)
+            states = await asyncio.gather(
+                *[server.request_state("1", epoch) for _ in range(10)]
+            )
+            await server.stop()
+            return states, server.counters.to_dict()
+
+        states, stats = asyncio.run(run())
+        _, pos, vel = self.propagator.get_state_at_epoch(UTC(self.END_EPOCH))
+        for _, p, v in states:
+            self.assertAlmostEqual(pos.x, p.x, 7)
+            self.assertAlmostEqual(pos.y, p.y, 7)
+            self.assertAlmostEqual(vel.z, v.z, 7)
+        self.assertEqual(10, stats["requests"])
+        self.assertEqual(1, stats["batches"])
+        self.assertEqual(1, stats["propagations"])
+
+    def test_socket_requests(self):
+        """
+        Test state, stats, and error requests over a local socket
+        """
+        async def run():
+            server = PropagationServer(self.catalog)
+            host, port = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            requests = [
+                {"ref": 0, "id": "1", "epoch": self.END_EPOCH},
+                {"ref": 1, "id": "2", "epoch": self.END_EPOCH}
+            ]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+            responses = {}
+            for _ in requests:
+                response = json.loads(await reader.readline())
+                responses[response["ref"]] = response
+            writer.write(b'{"ref": 2, "op": "stats"}\n')
+            responses[2] = json.loads(await reader.readline())
+            writer.close()
+            await server.stop()
+            return responses
+
+        responses = asyncio.run(run())
+        _, pos, _ = self.propagator.get_state_at_epoch(UTC(self.END_EPOCH))
+        self.assertAlmostEqual(pos.x, responses[0]["position"][0], 7)
+        self.assertIn("KeyError", responses[1]["error"])
+        self.assertEqual(2, responses[2]["stats"]["requests"])
+        self.assertEqual(1, responses[2]["stats"]["failures"])
+
+    def test_malformed_requests(self):
+        """
+        Test that requests failing before a batch are counted as failures
+        """
+        async def run():
+            server = PropagationServer(self.catalog)
+            host, port = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            for line in [b"not json\n", b'{"epoch": "Mar 04 2022"}\n']:
+                writer.write(line)
+                self.assertIn("error", json.loads(await reader.readline()))
+            writer.close()
+            await server.stop()
+            return server.counters.to_dict()
+
+        stats = asyncio.run(run())
+        self.assertEqual(2, stats["requests"])
+        self.assertEqual(2, stats["failures"])
+        self.assertEqual(0, stats["batches"])
+        self.assertEqual(0, stats["mean_batch_size"])
+
+    def test_line_over_limit(self):
+        """
+        Test that a request longer than the stream limit gets an error
+        response and the connection is closed
+        """
+        async def run():
+            server = PropagationServer(self.catalog)
+            host, port = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"x"*(2**17) + b"\n")
+            response = json.loads(await asyncio.wait_for(reader.readline(), 2))
+            remainder = await asyncio.wait_for(reader.read(), 2)
+            writer.close()
+            await server.stop()
+            return response, remainder, server.counters.to_dict()
+
+        response, remainder, stats = asyncio.run(run())
+        self.assertIn("error", response)
+        self.assertEqual(b"", remainder)
+        self.assertEqual(1, stats["requests"])
+        self.assertEqual(1, stats["failures"])
+
+    def test_propagation_key_error(self):
+        """
+        Test that a KeyError raised while propagating a known object is not
+        reported as an unknown object
+        """
+        async def run():
+            server = PropagationServer(self.catalog)
+            with mk.patch.object(
+                self.propagator, "get_states_at_epochs",
+                side_effect=KeyError("inside")
+            ):
+                with self.assertRaises(KeyError) as context:
+                    await server.request_state("1", UTC(self.END_EPOCH))
+            await server.stop()
+            return context.exception
+
+        error = asyncio.run(run())
+        self.assertNotIn("unknown object", str(error))
+
+    def test_stop(self):
+        """
+        Test that stopping fails unsolved requests and disconnects clients
+        """
+        async def run():
+            server = PropagationServer(self.catalog, batch_window=10)
+            host, port = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            request = asyncio.create_task(
+                server.request_state("1", UTC(self.END_EPOCH))
+            )
+            await asyncio.sleep(.01)
+            await asyncio.wait_for(server.stop(), 2)
+            with self.assertRaises(ConnectionAbortedError):
+                await asyncio.wait_for(request, 2)
+            self.assertEqual(b"", await asyncio.wait_for(reader.read(), 2))
+            writer.close()
+            return server.counters.to_dict()
+
+        stats = asyncio.run(run())
+        self.assertEqual(1, stats["failures"])
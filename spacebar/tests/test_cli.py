@@ -0,0 +1,150 @@
+import csv
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from spacebar import cli
+from spacebar.time.utc import UTC
+from spacebar.math.linalg import Vector3D
+from spacebar.astro.propagators.inertial import TwoBody
+from spacebar.astro.orbit.elements import ClassicalElements
+
+class TestCLI(unittest.TestCase):
+
+    EPOCH = "Mar 04 2022 04:42:42.000"
+    START_POSITION = Vector3D(10000, 40000, -5000)
+    START_VELOCITY = Vector3D(-1.5, 1, -.1)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "out")
+        self.states = os.path.join(self.directory.name, "states.csv")
+        with open(self.states, "w") as f:
+            f.write("id,epoch,x,y,z,vx,vy,vz\n")
+            f.write("1,%s,10000,40000,-5000,-1.5,1,-.1\n" % self.EPOCH)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv_states(self):
+        """
+        Test CSV output for a state file against direct propagation
+        """
+        code = cli.main([
+            self.states, "--duration", "3600", "--step", "600",
+            "-o", self.output
+        ])
+        self.assertEqual(0, code)
+        with open(self.output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(7, len(rows))
+
+        tb = TwoBody(UTC(self.EPOCH), self.START_POSITION, self.START_VELOCITY)
+        _, pos, vel = tb.get_state_at_epoch(UTC(rows[-1]["epoch"]))
+        self.assertEqual("Mar 04 2022 05:42:42.000000", rows[-1]["epoch"])
+        self.assertAlmostEqual(pos.x, float(rows[-1]["x"]), 9)
+        self.assertAlmostEqual(vel.z, float(rows[-1]["vz"]), 9)
+
+    def test_binary_elements(self):
+        """
+        Test binary output for an element file
+        """
+        coes = ClassicalElements.from_position_and_velocity(
+            self.START_POSITION, self.START_VELOCITY
+        )
+        elements = os.path.join(self.directory.name, "elements.csv")
+        with open(elements, "w") as f:
+            f.write("id,epoch,sma,inc,ecc,raan,aop,ma\n")
+            f.write("1,%s,%r,%r,%r,%r,%r,%r\n" % (
+                self.EPOCH, coes.semi_major_axis, coes.inclination,
+                coes.eccentricity, coes.raan, coes.arg_of_perigee,
+                coes.mean_anomaly
+            ))
+        code = cli.main([
+            elements, "--duration", "0", "--format", "binary",
+            "-o", self.output
+        ])
+        self.assertEqual(0, code)
+        with open(self.output, "rb") as f:
+            data = f.read()
+        record = struct.Struct(cli.BINARY_RECORD_FORMAT)
+        self.assertEqual(record.size, len(data))
+        index, timestamp, x, y, z, vx, vy, vz = record.unpack(data)
+        self.assertEqual(0, index)
+        self.assertAlmostEqual(UTC(self.EPOCH).timestamp, timestamp, 7)
+        self.assertAlmostEqual(self.START_POSITION.x, x, 6)
+        self.assertAlmostEqual(self.START_VELOCITY.y, vy, 9)
+
+    def test_bad_header(self):
+        """
+        Test that an unrecognized input file exits with an error
+        """
+        with open(self.states, "w") as f:
+            f.write("a,b,c\n1,2,3\n")
+        with self.assertRaises(SystemExit) as context:
+            cli.main([self.states, "-o", self.output])
+        self.assertEqual(1, context.exception.code)
+
+    def test_lazy_imports(self):
+        """
+        Test that importing the entry point does not load propagation modules
+        """
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, spacebar.cli; "
+                "print('spacebar.astro.propagators.inertial' in sys.modules)"
+            ],
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual("False", result.stdout.strip())
+
+    def test_csv_quoting(self):
+        """
+        Test that identifiers containing commas are quoted in CSV output
+        """
+        with open(self.states, "w") as f:
+            f.write("id,epoch,x,y,z,vx,vy,vz\n")
+            f.write('"a,b",%s,10000,40000,-5000,-1.5,1,-.1\n' % self.EPOCH)
+        cli.main([self.states, "--duration", "0", "-o", self.output])
+        with open(self.output, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(cli.STATE_COLUMNS, rows[0])
+        self.assertEqual(8, len(rows[1]))
+        self.assertEqual("a,b", rows[1][0])
+
+    def test_bad_values(self):
+        """
+        Test that arithmetic failures from bad input exit with an error
+        """
+        zero = os.path.join(self.directory.name, "zero.csv")
+        with open(zero, "w") as f:
+            f.write("id,epoch,x,y,z,vx,vy,vz\n")
+            f.write("1,%s,0,0,0,0,0,0\n" % self.EPOCH)
+        for argv in [
+            [zero, "-o", self.output],
+            [self.states, "--duration", "inf", "-o", self.output]
+        ]:
+            with self.assertRaises(SystemExit) as context:
+                cli.main(argv)
+            self.assertEqual(1, context.exception.code)
+
+    def test_broken_pipe(self):
+        """
+        Test that a reader closing stdout early is not reported as an error
+        """
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "spacebar.cli", self.states,
+                "--duration", "200000", "--step", "1"
+            ],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        process.stdout.readline()
+        process.stdout.close()
+        _, stderr = process.communicate(timeout=60)
+        self.assertEqual(b"", stderr)
+        self.assertEqual(0, process.returncode)